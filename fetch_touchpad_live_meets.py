@@ -1,205 +1,359 @@
 """
 Script to use the TouchPad Live REST API endpoints to collect all TouchPad Live meets for your team
+
+Required python packages need to be pip-installed and in the PYTHONPATH before running:
+pip install aiohttp aiohttp-client-cache[sqlite] httpx[http2] orjson tenacity
 """
 
-import json
-import urllib.request
+import asyncio
+import contextlib
 import urllib.parse
 import argparse
 import datetime
-import time
+import email.utils
 import pprint as pp
-import concurrent.futures
+import aiohttp
+import httpx
+import orjson
+import tenacity
 
-from typing import List, Dict, Tuple, Union
-from statistics import mode, StatisticsError
-from functools import wraps
-from math import ceil
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from enum import Enum
+from typing import List, Dict, FrozenSet, Optional, Set, Union
+from collections import Counter
 
 _DEFAULT_STATE = "VA"
-_SEARCH_URL_TEMPLATE = (
-    "https://www.touchpadlive.com/rest/touchpadlive/meets?offset={offset}&pattern={team}&state={state}&year={year}"
-)
-_MEET_URL_TEMPLATE = "https://www.touchpadlive.com/rest/touchpadlive/meets/{meet_id}"
-_MEET_TEAMS_URL_TEMPLATE = "https://www.touchpadlive.com/rest/touchpadlive/meets/{meet_id}/teams"
-_MEET_ATTENDEES_URL_TEMPLATE = "https://www.touchpadlive.com/rest/touchpadlive/meets/{meet_id}/attendees"
+_CURRENT_YEAR = datetime.date.today().year
+_MAX_CONCURRENT_REQUESTS = 64  # in-flight requests allowed against the TouchPad Live host at once
+_KEEPALIVE_TIMEOUT_SECONDS = 60
+_MAX_TRIES = 5  # number of times to try (not retry) a request before giving up
+_MAX_BACKOFF_SECONDS = 30  # cap on the exponential backoff between tries
+_DEFAULT_RETRY_AFTER_SECONDS = 5  # pause after a 429 Too Many Requests that does not say how long to back off
+_PAGE_PREFETCH_WINDOW = 8  # meet search result pages requested together, ahead of knowing where the results end
+_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+_CACHE_PATH = "tpl_cache.sqlite"
+_CACHE_EXPIRE_AFTER = datetime.timedelta(days=30)
+# Meets, and the teams in them, are still being added for the current year
+_CURRENT_YEAR_EXPIRE_AFTER = datetime.timedelta(hours=1)
+_MEETS_URL = "https://www.touchpadlive.com/rest/touchpadlive/meets"
+# Per-meet URLs are built by concatenating <prefix><meet_id><suffix>, e.g.
+# https://www.touchpadlive.com/rest/touchpadlive/meets/{meet_id}/teams
+_MEET_URL_PREFIX = _MEETS_URL + "/"
+_MEET_TEAMS_URL_SUFFIX = "/teams"
+_MEET_ATTENDEES_URL_SUFFIX = "/attendees"
+
+
+class MeetSearchStatus(Enum):
+    """Outcome of searching a meet's teams for our team(s)"""
+
+    KEEP = "keep"
+    EMPTY = "empty"
+    NOT_OURS = "not_ours"
+
+
+class _RequestLimiter:
+    """Async context manager capping how many API requests are in flight at once.
+
+    The cap starts at ``max_in_flight``, and is lowered to what the server reports is left of its rate limit (in
+    ``X-RateLimit-Remaining`` response headers) when that gets low. When the server responds with a 429 Too Many
+    Requests, every request (new ones and retries) is held back until its ``Retry-After`` has passed.
+    """
 
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.limit = max_in_flight
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._slot_freed = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        pause = self._resume_at - asyncio.get_running_loop().time()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    async def __aexit__(self, *exc_info):
+        async with self._slot_freed:
+            self._in_flight -= 1
+            self._slot_freed.notify(self.limit - self._in_flight)
+
+    def update_from_response(self, status: int, headers):
+        remaining = headers.get("X-RateLimit-Remaining", "")
+        if remaining.isdigit():
+            self.limit = max(1, min(self.max_in_flight, int(remaining)))
+        if status == 429:
+            resume_at = asyncio.get_running_loop().time() + _retry_after_seconds(headers)
+            self._resume_at = max(self._resume_at, resume_at)
+
+
+def _retry_after_seconds(headers) -> float:
+    """Seconds to wait as given by a Retry-After header, which is either a number of seconds or an HTTP date"""
+    retry_after = headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER_SECONDS
 
-def _build_search_url(year=datetime.date.today().year, team="", state=_DEFAULT_STATE, offset=0):
-    return _SEARCH_URL_TEMPLATE.format(**locals())
 
+# Client shared by every request of a run: a (caching) aiohttp session, or an HTTP/2 httpx client
+Session = Union[aiohttp.ClientSession, httpx.AsyncClient]
 
-def infer_team_id(meets: List[Dict]):
-    print("Determining your specific team ID from the team name you provided...")
-    team_ids = []
-    for meet in meets:
-        meet_teams_url = _MEET_TEAMS_URL_TEMPLATE.format(meet_id=meet["id"])
-        teams = get_json_from_url_with_retry(meet_teams_url)
-        if not teams:
-            continue  # must be teams in the meet to count it
-        for team in teams:
-            team_ids.append(team["teamID"])
-    team_id = None
-    try:
-        team_id = mode(team_ids)
-        print(
-            f"Inferred that your team ID is {team_id}, beause that occurred most frequently in the meets found with your provided team name"
+# Gates every request made to the TouchPad Live API in this run
+_request_limiter = _RequestLimiter(_MAX_CONCURRENT_REQUESTS)
+
+# In-flight or finished /meets/{meet_id}/teams requests of this run, so concurrent and repeated lookups of the same
+# meet share a single request
+_meet_teams_requests: Dict[int, asyncio.Task] = {}
+
+# IDs of the teams in each meet looked up in this run
+_meet_team_ids: Dict[int, FrozenSet[int]] = {}
+
+# IDs of the meets found by searching the current year in this run. Their team lookups are only cached as long as the
+# current year's searches are, since teams show up in a meet once it is swum
+_current_year_meet_ids: Set[int] = set()
+
+
+def _build_response_cache():
+    """On-disk cache of the (GET-only) API responses, so re-runs do not have to re-fetch meets of past years"""
+    current_year_search = f"*year={_CURRENT_YEAR}"
+    return SQLiteBackend(
+        _CACHE_PATH,
+        expire_after=_CACHE_EXPIRE_AFTER,
+        urls_expire_after={current_year_search: _CURRENT_YEAR_EXPIRE_AFTER},
+    )
+
+
+def _build_search_url(year=_CURRENT_YEAR, team="", state=_DEFAULT_STATE, offset=0):
+    return f"{_MEETS_URL}?offset={offset}&pattern={team}&state={state}&year={year}"
+
+
+def _build_meet_url(meet_id: int):
+    return _MEET_URL_PREFIX + str(meet_id)
+
+
+def _build_meet_teams_url(meet_id: int):
+    return _MEET_URL_PREFIX + str(meet_id) + _MEET_TEAMS_URL_SUFFIX
+
+
+def _build_meet_attendees_url(meet_id: int):
+    return _MEET_URL_PREFIX + str(meet_id) + _MEET_ATTENDEES_URL_SUFFIX
+
+
+async def get_meet_teams(session: Session, meet_id: int):
+    """Get the teams in a meet, only requesting them from the API the first time the meet is looked up"""
+    if meet_id not in _meet_teams_requests:
+        meet_teams_url = _build_meet_teams_url(meet_id)
+        expire_after = _CURRENT_YEAR_EXPIRE_AFTER if meet_id in _current_year_meet_ids else None
+        _meet_teams_requests[meet_id] = asyncio.ensure_future(
+            get_json_from_url_with_retry(session, meet_teams_url, expire_after=expire_after)
         )
-    except StatisticsError:
+    return await _meet_teams_requests[meet_id]
+
+
+async def get_meet_team_ids(session: Session, meet_id: int) -> FrozenSet[int]:
+    """Get the IDs of the teams in a meet (empty if the meet has no teams), only collecting them the first time the
+    meet is looked up"""
+    if meet_id not in _meet_team_ids:
+        teams = await get_meet_teams(session, meet_id)
+        _meet_team_ids[meet_id] = frozenset(team["teamID"] for team in teams or ())
+    return _meet_team_ids[meet_id]
+
+
+async def infer_team_id(session: Session, meets: List[Dict]):
+    print("Determining your specific team ID from the team name you provided...")
+    team_id_counts = Counter()
+    for team_ids_in_meet in await asyncio.gather(*(get_meet_team_ids(session, meet["id"]) for meet in meets)):
+        team_id_counts.update(team_ids_in_meet)  # a meet must have teams to count it
+    if not team_id_counts:
         raise SystemExit(
             "Could not get a TouchPad Live Team ID from that Team Name. ",
             "Either try a more unique fragment of your team name, ",
             "or search the request/response payloads using browser tools ",
             "for a meet you know your team participated in to get the integer team ID, and pass it in with the --team-ids arg",
         )
+    team_id, _ = team_id_counts.most_common(1)[0]
+    print(
+        f"Inferred that your team ID is {team_id}, beause that occurred most frequently in the meets found with your provided team name"
+    )
     return team_id
 
 
-def fetch_meets(
+async def fetch_meets(
+    session: Session,
     team_name: str = "",
     state: str = _DEFAULT_STATE,
     years: List[int] = None,
 ):
+    """Fetch the meets of every given year, with all years being searched concurrently"""
     if years is None:
-        years = [datetime.date.today().year]
-    all_meets = []
-    for year in years:
-        print(f"\tFetching meets for {year}")
-        meets_in_year = 0
-        offset = 0
-        url = _build_search_url(year=year, team=team_name, state=state, offset=offset)
-        while True:
-            data = get_json_from_url_with_retry(url)
-            meets_in_year += len(data)
+        years = [_CURRENT_YEAR]
+    meets_by_year = await asyncio.gather(
+        *(_fetch_meets_in_year(session, year, team_name=team_name, state=state) for year in years)
+    )
+    return [meet for meets_in_year in meets_by_year for meet in meets_in_year]
+
+
+async def _fetch_meets_in_year(session: Session, year: int, team_name: str, state: str):
+    """Page through the meet search results for one year, requesting ``_PAGE_PREFETCH_WINDOW`` pages at a time
+    until an empty page signals the end of the results"""
+    print(f"\tFetching meets for {year}")
+    meets_in_year = []
+    offset = 0  # offset is by page, not by meet items ¯\_(ツ)_/¯
+    while True:
+        pages = await asyncio.gather(
+            *(
+                get_json_from_url_with_retry(
+                    session, _build_search_url(year=year, team=team_name, state=state, offset=page_offset)
+                )
+                for page_offset in range(offset, offset + _PAGE_PREFETCH_WINDOW)
+            )
+        )
+        for data in pages:
             if not data:
-                break
-            else:
-                all_meets.extend(data)
-                offset += 1  # offset is by page, not by meet items ¯\_(ツ)_/¯
-                url = _build_search_url(year=year, team=team_name, state=state, offset=offset)
-        print(f"\tFound {meets_in_year} meets from {year}")
+                print(f"\tFound {len(meets_in_year)} meets from {year}")
+                if int(year) == _CURRENT_YEAR:
+                    _current_year_meet_ids.update(meet["id"] for meet in meets_in_year)
+                return meets_in_year
+            meets_in_year.extend(data)
+        offset += _PAGE_PREFETCH_WINDOW
 
-    return all_meets
 
+async def filter_meets_by_team_ids(
+    session: Session, meets: List[Dict], team_ids: List[int], state: str = _DEFAULT_STATE
+):
+    """Filter out meets that do not include the given team IDs
 
-def filter_meets_by_team_ids(meets: List[Dict], team_ids: List[int]):
-    """Filter out meets that do not include the given team IDs"""
-    empty_meets = []
-    not_our_team = []
+    The per-meet team lookups are all dispatched at once on the event loop, and the request limiter decides how many
+    of them are in flight at any time. Meets whose payload shows they were run in another state are ruled out without a
+    lookup.
+    """
     meet_count = len(meets)
     print(f"Found {meet_count} meets run in your state. Searching through them for your team with ID(s) {team_ids}...")
 
-    def search_meet(meet):
+    team_ids_set = {int(team_id) for team_id in team_ids}
+    searched = 0
+    last_decile_reported = 0
+
+    async def search_meet(meet):
+        nonlocal searched, last_decile_reported
         meet_id = meet["id"]
-        meet_teams_url = _MEET_TEAMS_URL_TEMPLATE.format(meet_id=meet_id)
-        teams_json = get_json_from_url_with_retry(meet_teams_url)
-        if not teams_json:
-            return meet_id, False
-        teams_in_meet = [t["teamID"] for t in teams_json]
-        if not any(int(our_team) in teams_in_meet for our_team in team_ids):
-            return False, meet_id
-        return False, False
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        searches = {executor.submit(search_meet, m): (i, m) for i, m in enumerate(meets)}
-        finished = 0
-        progress_updates = 0
-        for search in concurrent.futures.as_completed(searches):
-            (i, meet_to_search) = searches[search]
-
-            # Update progress
-            finished = ceil(100 * (i / meet_count))
-            if divmod(finished, 10) == (progress_updates, 0):
-                progress_updates += 1
-                print(f"Finished searching through {finished}% of meets")
-
-            # Check results to decide if this is a meet we keep
-            empty_meet, not_us = search.result()
-            if empty_meet:
-                empty_meets.append(empty_meet)
-            if not_us:
-                not_our_team.append(not_us)
-
-    to_remove = empty_meets + not_our_team
-    print(f"Filtering out {len(to_remove)} of {meet_count} meets.")
-    print(f"\t{len(empty_meets)} meets are empty.")
-    print(f"\t{len(not_our_team)} meets do not contain your team(s) ({team_ids}).")
-    our_meets = [m for m in meets if m["id"] not in to_remove]
+        if str(meet.get("state") or state).upper() != state.upper():
+            team_ids_in_meet = None  # can't be one of ours, so don't spend a round trip listing its teams
+        else:
+            team_ids_in_meet = await get_meet_team_ids(session, meet_id)
+
+        # Update progress, as searches finish in whatever order their responses come back
+        searched += 1
+        decile = searched * 10 // meet_count
+        if decile > last_decile_reported:
+            last_decile_reported = decile
+            print(f"Finished searching through {decile * 10}% of meets")
+
+        if team_ids_in_meet is None:
+            return meet_id, MeetSearchStatus.NOT_OURS
+        if not team_ids_in_meet:
+            return meet_id, MeetSearchStatus.EMPTY
+        if team_ids_in_meet.isdisjoint(team_ids_set):
+            return meet_id, MeetSearchStatus.NOT_OURS
+        return meet_id, MeetSearchStatus.KEEP
+
+    tasks = [search_meet(m) for m in meets]
+    search_results = await asyncio.gather(*tasks)
+
+    # Check results to decide which meets we keep
+    kept_ids = {meet_id for meet_id, status in search_results if status is MeetSearchStatus.KEEP}
+    empty_count = sum(status is MeetSearchStatus.EMPTY for _, status in search_results)
+    not_ours_count = sum(status is MeetSearchStatus.NOT_OURS for _, status in search_results)
+
+    print(f"Filtering out {empty_count + not_ours_count} of {meet_count} meets.")
+    print(f"\t{empty_count} meets are empty.")
+    print(f"\t{not_ours_count} meets do not contain your team(s) ({team_ids}).")
+    our_meets = [m for m in meets if m["id"] in kept_ids]
     return our_meets
 
 
-def retryable(
-    exception_to_check: Union[Exception, Tuple[Exception]] = (Exception,),
-    tries: int = 5,
-    pause_before_try: float = 0.0,
-    backoff: int = 1,
-    backoff_factor: int = 2,
+def _print_retry(retry_state: tenacity.RetryCallState):
+    print(
+        f"Retrying in {retry_state.next_action.sleep:.2f} seconds..."
+        f" After receiving retryable Error: {str(retry_state.outcome.exception())}"
+    )
+
+
+@tenacity.retry(
+    stop=tenacity.stop_after_attempt(_MAX_TRIES),
+    wait=tenacity.wait_exponential(multiplier=1, max=_MAX_BACKOFF_SECONDS),
+    retry=tenacity.retry_if_exception_type((aiohttp.ClientError, httpx.HTTPError, asyncio.TimeoutError)),
+    before_sleep=_print_retry,
+    reraise=True,
+)
+async def get_json_from_url_with_retry(
+    session: Session, url: str, expire_after: Optional[datetime.timedelta] = None
 ):
-    """Decorator used to retry decorated function with exponential backoff.
-
-    Args:
-        exception_to_check: (Union[Exception, Tuple[Exception]]): the exception to check. may be a tuple of
-            exceptions to check
-        tries (int): number of times to try (not retry) before giving up
-        pause_before_try (float): how long to pause in seconds before ANY and EVERY try
-        backoff (int): how many seconds to backoff the first time a try fails
-        backoff_factor (int): backoff multiplier e.g. value of 2 will double the delay
-            each retry
+    """GET JSON from the API. ``expire_after`` overrides how long the response is cached for (when it is cached)"""
+    async with _request_limiter:
+        if isinstance(session, httpx.AsyncClient):
+            response = await session.get(url)
+            _request_limiter.update_from_response(response.status_code, response.headers)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        # Only a CachedSession takes expire_after; a plain aiohttp.ClientSession rejects it
+        cache_kwargs = {"expire_after": expire_after} if expire_after and isinstance(session, CachedSession) else {}
+        async with session.get(url, **cache_kwargs) as response:
+            if not getattr(response, "from_cache", False):  # rate limit headers of a cached response are stale
+                _request_limiter.update_from_response(response.status, response.headers)
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
+
+async def _open_http2_client():
+    """Open a client that multiplexes every request as a stream over one HTTP/2 connection.
+
+    Returns None (after closing the client) if the server does not negotiate HTTP/2.
     """
+    client = httpx.AsyncClient(http2=True, limits=httpx.Limits(max_connections=1, max_keepalive_connections=1))
+    try:
+        probe = await client.get(_build_search_url())
+    except httpx.HTTPError:
+        await client.aclose()
+        return None
+    if probe.http_version != "HTTP/2":
+        await client.aclose()
+        return None
+    return client
+
+
+def _write_json(path: str, data):
+    with open(path, "wb", buffering=_WRITE_BUFFER_SIZE) as json_file:
+        json_file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+
+
+async def _open_session(open_sessions: contextlib.AsyncExitStack, http2: bool = False) -> Session:
+    """Open the client that every request of the run will share, to be closed when ``open_sessions`` exits"""
+    if http2:
+        client = await _open_http2_client()
+        if client is not None:
+            print("Multiplexing all requests over one HTTP/2 connection (responses are not cached)")
+            open_sessions.push_async_callback(client.aclose)
+            return client
+        print("The server did not negotiate HTTP/2. Falling back to HTTP/1.1")
+
+    # Every request goes to the same host, so resolve it once, and keep idle connections open long enough to be picked
+    # back up by the next phase (e.g. the state-wide search after inferring the team ID) instead of re-doing TCP + TLS
+    # handshakes.
+    connector = aiohttp.TCPConnector(
+        limit_per_host=_MAX_CONCURRENT_REQUESTS,
+        keepalive_timeout=_KEEPALIVE_TIMEOUT_SECONDS,
+        ttl_dns_cache=None,
+    )
+    return await open_sessions.enter_async_context(CachedSession(cache=_build_response_cache(), connector=connector))
 
-    def decorator(fn):
-        @wraps(fn)
-        def retry(*args, **kwargs):
-            this_try = 1
-            current_backoff = backoff
-            while this_try < tries:
-                if pause_before_try:
-                    time.sleep(pause_before_try)
-                try:
-                    return fn(*args, **kwargs)  # attempt a (re)try if allowed more than one try
-                except Exception as exc_val:
-                    exc_type = type(exc_val)
-
-                    if exc_type is not None:
-                        print(f"Found error: {str(exc_type)}... checking if in {exception_to_check}")
-                    else:
-                        print("NONE exception")
-                        return
-
-                    if not issubclass(exc_type, exception_to_check):
-                        print("OTHER exception")
-                        return
-                    if exc_type is not None and issubclass(exc_type, exception_to_check):
-                        # Try again if you have tries left
-                        if this_try < tries:  # do the retry
-                            print(
-                                f"Retrying in {pause_before_try + current_backoff:.2f} seconds..."
-                                f" After receiving retryable Error: {str(exc_val)}"
-                            )
-                            this_try += 1
-                            time.sleep(current_backoff)
-                            current_backoff *= backoff_factor
-                        else:
-                            print("No more tries left :(")
-                    if exc_type is not None and not issubclass(exc_type, exception_to_check):
-                        print("NON-RETRYABLE exception" + str(exc_val))
-                        raise exc_val
-
-            # Last and unguarded call attempt, after all retries (if any) have been attempted
-            return fn(*args, **kwargs)
-
-        return retry  # wrapper --around--> wrapped function
-
-    return decorator  # @retryable(arg[, ...]) decorator --delegating-to--> wrapper
-
-
-@retryable()
-def get_json_from_url_with_retry(url: str):
-    with urllib.request.urlopen(url) as response:
-        return json.loads(response.read())
-
-
-def main(parser: argparse.ArgumentParser):
+
+async def main(parser: argparse.ArgumentParser):
     # A single meet with ID=1: https://www.touchpadlive.com/rest/touchpadlive/meets/1
 
     # Search for Meets: https://www.touchpadlive.com/rest/touchpadlive/meets?offset=0&state=VA&year=2023
@@ -207,30 +361,37 @@ def main(parser: argparse.ArgumentParser):
     args = parser.parse_args()
     if args.team:
         team = urllib.parse.quote_plus(args.team)
-    state = args.state
-    years = range(2012, datetime.date.today().year) if not args.year else [args.year]
+    state = args.state.upper()
+    years = range(2012, _CURRENT_YEAR) if not args.year else [args.year]
     urls_only = args.print_urls_only
 
-    team_ids = args.team_ids
-    if not args.team_ids:
-        print(f'Fetching meets that match your provided team name: "{team}"...')
-        team_ids = [infer_team_id(fetch_meets(team, state, years))]
+    async with contextlib.AsyncExitStack() as open_sessions:
+        session = await _open_session(open_sessions, http2=args.http2)
+
+        team_ids = args.team_ids
+        if not args.team_ids:
+            print(f'Fetching meets that match your provided team name: "{team}"...')
+            team_ids = [await infer_team_id(session, await fetch_meets(session, team, state, years))]
 
-    print(f"Fetching all meets that occurred in the state of {state} from {min(years)} to {max(years)}")
-    all_state_meets = fetch_meets(years=years)
+        print(f"Fetching all meets that occurred in the state of {state} from {min(years)} to {max(years)}")
+        all_state_meets = await fetch_meets(session, state=state, years=years)
 
-    participated_meets = filter_meets_by_team_ids(all_state_meets, team_ids)
+        participated_meets = await filter_meets_by_team_ids(session, all_state_meets, team_ids, state)
     meet_urls = []
     for pm in participated_meets:
         pm["url"] = f"http://www.touchpadlive.com/{pm['id']}"
         meet_urls.append(pm["url"])
+
+    meets_path = f"{'_'.join(map(str, team_ids))}_meets.json"
     print(f"Found {len(participated_meets)} meets your team participated in:")
     if urls_only:
         [print(u) for u in meet_urls]
-    else:
+    elif args.verbose:
         pp.pprint(participated_meets)
-    with open(f"{'_'.join([str(tid) for tid in team_ids])}_meets.json", "w") as meets_file:
-        json.dump(participated_meets, meets_file)
+    else:
+        [print(f"{pm['url']}\t{pm.get('startDate', '')}\t{pm.get('name', '')}") for pm in participated_meets]
+    _write_json(meets_path, participated_meets)
+    print(f"Saved meets to {meets_path}")
 
 
 if __name__ == "__main__":
@@ -269,5 +430,19 @@ if __name__ == "__main__":
         default=False,
         help="Only list the Meet URL " "in the final results. " "Full JSON file is still " "saved to filesystem.",
     )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        default=False,
+        help="Print the full details of each meet in the final results, rather than one summary line per meet.",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        default=False,
+        help="Send all requests over one multiplexed HTTP/2 connection, if the server supports it. "
+        "Responses are not cached on disk when using HTTP/2.",
+    )
 
-    main(parser)
+    asyncio.run(main(parser))
@@ -3,7 +3,9 @@ Script to convert, read, or write Swimming Data Interchange Files (SDIF, .sd3) f
 Team Unify and/or TouchPad source.
 
 Required python packages need to be pip-installed and in the PYTHONPATH before running:
-pip install sdif pandas openpyxl
+pip install sdif "pandas>=2.2" openpyxl python-calamine pyarrow
+(pandas 2.2 or newer is needed to read Excel files with the calamine engine)
+Optionally, to parse JSON faster: pip install orjson
 
 Best explanation of the SDIF format: http://www.winswim.com/ftp/Standard%20Data%20Interchange%20Format.pdf
 Less reable spec: https://www.usms.org/admin/sdifv3f.txt
@@ -16,18 +18,28 @@ Less reable spec: https://www.usms.org/admin/sdifv3f.txt
 # TODO: Move assumed values up as constants to promote easier re-use via config files; e.g. summer_swim_team=True, state, etc.
 
 
+import os
 import sys
 import re
+import collections
+import contextlib
+import concurrent.futures
+import functools
+import itertools
 import datetime
 import json
 import sdif
 import pathlib
 import pprint as pp
 import pandas as pd
-import numpy as np
-import warnings
 
-from openpyxl.styles import Alignment
+try:
+    import orjson
+except ImportError:  # optional, just parses JSON faster
+    orjson = None
+
+import openpyxl
+from openpyxl.styles import Alignment, Font, NamedStyle
 from decimal import Decimal
 from typing import ClassVar, Optional, Callable, Literal, List, Tuple
 from sdif.model_meta import model, spec
@@ -35,7 +47,6 @@ from sdif.fields import FieldType
 from sdif.models import (
     FileCode,
     OrganizationCode,
-    TimeT,
     TimeCode,
     Time,
 )
@@ -43,8 +54,53 @@ from sdif.models import (
 
 t = FieldType
 
+_TIMECODE_BY_VALUE = {tc.value: tc for tc in TimeCode}
+
+# Categorical dtypes for the enum columns, ordered by their SDIF code values to sort events by
+_STROKE_DTYPE = pd.CategoricalDtype(sorted(sdif.models.StrokeCode, key=lambda c: c.value), ordered=True)
+_EVENT_SEX_DTYPE = pd.CategoricalDtype(sorted(sdif.models.EventSexCode, key=lambda c: c.value), ordered=True)
+_SEX_DTYPE = pd.CategoricalDtype(sorted(sdif.models.SexCode, key=lambda c: c.value), ordered=True)
+
+# Combining marks, like the accents NFKD normalization splits off of letters (e.g. "é" into "e" and "\u0301")
+_COMBINING_MARKS_RE = "[\u0300-\u036f]"
+
+# mmddyy birthday, which the start of a USS# is made from
+_MDY_RE = re.compile(r"^((?:0[1-9]|1[0-2])(?:0[1-9]|[12][0-9]|3[01])\d\d)")
+
 _INDIVIDUAL_OR_RELAY_FIELD = "individual_or_relay"
 
+# Fewest opponents' result rows (individual and relay) worth building in worker processes. Inline, records take about
+# 250us a row, while a forked pool takes about 0.1s to start, plus about 40us a row to pickle DataFrames over and
+# records back, so smaller meets (e.g. ~700 rows across 6 teams) are faster inline. Spawned workers (macOS, Windows)
+# cost more still, since each re-imports pandas
+_MIN_OPPONENT_ROWS_TO_PARALLELIZE = 10_000
+
+# Columns of the Team Unify results XLS files that are used. Exports differ a bit by type and vintage (e.g. "Date" or
+# "Date of\nSport", "Pts" or "Points"), so this covers all of them, and only the ones present in a file are read
+_RESULTS_XLS_COLUMNS = frozenset(
+    [
+        "Event",
+        "Athlete Name",
+        "Relay\nTeam",
+        "EventAge\nCurrent",
+        "LSC-Team",
+        "Finals",
+        "Finals Pos",
+        "Pts",
+        "Points",
+        "Date of\nSport",
+        "Date",
+    ]
+)
+_RESULTS_XLS_DTYPES = {
+    "Event": "string[pyarrow]",
+    "Athlete Name": "string[pyarrow]",
+    "Relay\nTeam": "string[pyarrow]",
+    "EventAge\nCurrent": "string[pyarrow]",
+    "LSC-Team": "string[pyarrow]",
+    "Finals": "string[pyarrow]",
+}
+
 _SWIM_TEAM_INFO_PATH = pathlib.Path("swim_team_info.json")
 _SWIM_TEAM_INFO_DEFAULT = {
     "swim_team": {
@@ -63,11 +119,11 @@ _SWIM_TEAM_INFO_DEFAULT = {
 
 
 def _get_swim_team_info():
-    if _SWIM_TEAM_INFO_PATH.exists:
-        with open(_SWIM_TEAM_INFO_PATH) as sti:
-            return json.load(sti)
-    else:
+    try:
+        swim_team_info = _SWIM_TEAM_INFO_PATH.read_bytes()
+    except FileNotFoundError:
         return _SWIM_TEAM_INFO_DEFAULT
+    return orjson.loads(swim_team_info) if orjson else json.loads(swim_team_info)
 
 
 SWIM_TEAM_INFO = _get_swim_team_info()
@@ -78,6 +134,19 @@ SEASON_AGE_UP_MONTH = 6
 SEASON_AGE_UP_DAY = 15
 
 
+def _unregister_sdif_models(*identifiers: str):
+    """Free up record identifiers for this module's models. @model registers each model class by its identifier, and
+    asserts the identifier isn't registered yet. Identifiers that aren't registered are skipped, so loading this module
+    again (which re-registers its models) does not fail.
+    """
+    for identifier in identifiers:
+        sdif.model_meta.REGISTERED_MODELS.pop(identifier, None)
+
+
+# New models (B2), and overrides of sdif's models for TouchPad-specific sd3 quirks (Z0)
+_unregister_sdif_models("B2", "Z0")
+
+
 @model(frozen=True, kw_only=True)
 class MeetHostInfo:
     identifier: ClassVar[str] = "B2"
@@ -86,8 +155,6 @@ class MeetHostInfo:
     contact_phone: str = spec(start=121, len=12, type=t.phone)
 
 
-sdif.model_meta.REGISTERED_MODELS.pop("Z0")
-
 # @model(frozen=True, kw_only=True)
 # class TouchPadFileTerminator(FileTerminator):
 #     notes = spec(start=14, len=30, type=Optional[str])  # override to make notes optional
@@ -131,6 +198,16 @@ class TouchPadFileTerminator:
 # Override models for TouchPad-specific sd3 quirks
 sdif.model_meta.REGISTERED_MODELS["Z0"] = TouchPadFileTerminator
 
+# The Z0 record is the same in every file built, so it's encoded just once
+_Z0_RECORD = sdif.records.encode_record(
+    TouchPadFileTerminator(
+        organization=sdif.models.OrganizationCode.uss,
+        file_code=sdif.models.FileCode.meet_results,
+        notes=None,
+    ),
+    strict=False,
+)
+
 
 def transform_event_age(event_age_raw: str):
     age_code = "UNOV"  # default to no age limits
@@ -148,18 +225,65 @@ def transform_event_age(event_age_raw: str):
     return age_code
 
 
-def transform_swim_time(swim_time_raw: str) -> TimeT:
-    if swim_time_raw is None or swim_time_raw.strip() == "":
-        return TimeCode.no_swim
-    tc_match = [tc.name for tc in TimeCode if tc.value == swim_time_raw]
-    if tc_match:
-        return TimeCode[tc_match[0]]
-    return Time.from_str(swim_time_raw)
+def transform_event_ages(event_age_raw: pd.Series) -> pd.Series:
+    """Vectorized transform_event_age, which parses a whole column of event ages into SDIF age codes at once"""
+    age_raw = event_age_raw.astype("string")
+    is_range = age_raw.str.contains("-", regex=False, na=False)
+    is_age_limit = ~is_range & age_raw.str.contains("&", regex=False, na=False)
+    is_under = is_age_limit & age_raw.str.contains("under", case=False, regex=False, na=False)
+    is_over = is_age_limit & ~is_under & age_raw.str.contains("over", case=False, regex=False, na=False)
+
+    age_code = pd.Series("UNOV", index=age_raw.index, dtype="string")  # default to no age limits
+    age_range = age_raw[is_range].str.extract(r"^([^-]*)-([^-]*)$")
+    age_code[is_range] = age_range[0].str.zfill(2).str.cat(age_range[1].str.zfill(2))
+    age_code[is_under] = "UN" + age_raw[is_under].str.split(" ").str[0].str.zfill(2)
+    age_code[is_over] = age_raw[is_over].str.findall(r"(?<![^ ])\d+(?![^ ])").str.join("").str.zfill(2) + "OV"
+
+    is_invalid = age_raw.isna() | age_code.isna() | (age_code.str.len() != 4)
+    if is_invalid.any():
+        raise ValueError(
+            f'Could not parse event age of "{age_raw[is_invalid].iloc[0]}" into a 4 character SDIF age code. '
+            f'Resulted in: "{age_code[is_invalid].iloc[0]}"'
+        )
+    return age_code
+
+
+def transliterate_names(names: pd.Series) -> pd.Series:
+    """Transliterate names toward the ASCII that SDIF files are written in, by stripping accents (e.g. "José" to
+    "Jose"). Characters with no ASCII base letter (e.g. "Ø") are left for the SD3 writer to replace and warn about"""
+    return names.str.normalize("NFKD").str.replace(_COMBINING_MARKS_RE, "", regex=True)
+
+
+def transform_swim_times(swim_time_raw: pd.Series) -> pd.Series:
+    """Transform a column of swim times into SDIF times. Blanks are no swims, and time codes (e.g. DQ) are looked up,
+    so only the rest have to be parsed one by one"""
+    swim_time = swim_time_raw.astype("string")
+    is_no_swim = (swim_time.isna() | (swim_time.str.strip() == "")).fillna(True)
+    is_time_code = swim_time.isin(_TIMECODE_BY_VALUE.keys())
+    is_time = ~(is_no_swim | is_time_code)
+
+    swim_times = pd.Series(TimeCode.no_swim, index=swim_time.index, dtype=object)
+    swim_times[is_time_code] = swim_time[is_time_code].map(_TIMECODE_BY_VALUE)
+    swim_times[is_time] = swim_time[is_time].map(Time.from_str)
+    return swim_times
 
 
 def format_event_results_xls_dataframe(xls_path: pathlib.Path):
     """Parse common event results fields (for individual events and relays) from
     Team Unify meet results XLS file into a Pandas DataFrame
+
+    Each file is only parsed once (e.g. the relay file, for both relay events and relay swimmers). Callers get their
+    own copy of the parsed DataFrame to add to or modify.
+    """
+    return _format_event_results_xls_dataframe(xls_path).copy()
+
+
+@functools.lru_cache(maxsize=4)
+def _format_event_results_xls_dataframe(xls_path: pathlib.Path):
+    """Cached parse for format_event_results_xls_dataframe. The cached DataFrame must not be modified.
+
+    NOTE: lru_cache is thread-safe for its own bookkeeping, but concurrent first calls for the same path can each parse
+    the file.
     """
     ######################################
     #### IndividualEvent (D0) Records ####
@@ -197,11 +321,18 @@ def format_event_results_xls_dataframe(xls_path: pathlib.Path):
     # - flight_status: Optional[str] = spec(145, 1)
     # - centipoints_scored_finals: Optional[int] = spec(151, 2)
 
-    xls_df = None
-    with warnings.catch_warnings():  # suppress annoying openpyxl warnings about workbook style
-        warnings.simplefilter("ignore")
-        xls_df = pd.read_excel(xls_path, engine="openpyxl")
-    xls_df = xls_df.replace({np.nan: None})
+    # calamine parses the workbook in Rust rather than building openpyxl's full in-memory workbook
+    # Arrow-backed (nullable) dtypes, so blank cells are pd.NA without forcing columns to object dtype
+    xls_df = pd.read_excel(
+        xls_path,
+        engine="calamine",
+        usecols=lambda c: c in _RESULTS_XLS_COLUMNS,
+        dtype=_RESULTS_XLS_DTYPES,
+        dtype_backend="pyarrow",
+    )
+    for name_field in ("Athlete Name", "Relay\nTeam"):
+        if name_field in xls_df.columns:
+            xls_df[name_field] = transliterate_names(xls_df[name_field])
     xls_df["organization"] = sdif.models.OrganizationCode.uss
     xls_df["attached"] = sdif.models.AttachCode.attached
     xls_df["citizen"] = "USA"
@@ -227,7 +358,7 @@ def format_event_results_xls_dataframe(xls_path: pathlib.Path):
             "MR": sdif.models.StrokeCode.medley_relay,
             "Free Relay": sdif.models.StrokeCode.free_relay,
         }
-    )
+    ).astype(_STROKE_DTYPE)
 
     xls_df["event_sex"] = xls_df["event_sex_name"].map(
         {
@@ -235,8 +366,8 @@ def format_event_results_xls_dataframe(xls_path: pathlib.Path):
             "Female": sdif.models.EventSexCode.female,
             "Mixed": sdif.models.EventSexCode.mixed,
         }
-    )
-    xls_df["event_age"] = xls_df["event_age_title"].map(lambda x: transform_event_age(x)).astype(str)
+    ).astype(_EVENT_SEX_DTYPE)
+    xls_df["event_age"] = transform_event_ages(xls_df["event_age_title"])
 
     # Have to assume sex of the event, since Team Unify exports don"t track that on the results.
     # May fail if it's a mixed event
@@ -246,18 +377,21 @@ def format_event_results_xls_dataframe(xls_path: pathlib.Path):
             sdif.models.EventSexCode.female: sdif.models.SexCode.female,
             sdif.models.EventSexCode.mixed: None,
         }
-    )
-    xls_df["finals_time"] = xls_df["Finals"].map(lambda x: transform_swim_time(x))
+    ).astype(_SEX_DTYPE)
+    xls_df["finals_time"] = transform_swim_times(xls_df["Finals"])
     # TODO: May need to cross reference this against where it was actually swam,
     #  which could be yards
     xls_df["finals_time_course"] = FINALS_COURSE
 
     date_field = "Date of\nSport" if "Date of\nSport" in xls_df.columns else "Date"
-    xls_df["date_of_swim"] = pd.to_datetime(xls_df[date_field], format="%m/%d/%y").dt.date
+    # Kept as datetime64 for vectorized date math; only the results written to SDIF records become dates
+    xls_df["date_of_swim"] = pd.to_datetime(xls_df[date_field], format="%m/%d/%y")
     xls_df[["lsc", "team_code_tu"]] = xls_df["LSC-Team"].str.split(pat="-", expand=True)
-    xls_df["team_code4"] = xls_df["team_code_tu"].str[:4]
-    xls_df["team_code5"] = xls_df["team_code_tu"].str[4:]
-    xls_df["team_code"] = xls_df["lsc"] + xls_df["team_code4"]
+    # Split from an Arrow string column, so these slice and concatenate on Arrow buffers, not Python str objects
+    team_code_tu = xls_df["team_code_tu"]
+    xls_df["team_code4"] = team_code_tu.str.slice(0, 4)
+    xls_df["team_code5"] = team_code_tu.str.slice(4)
+    xls_df["team_code"] = xls_df["lsc"].str.cat(xls_df["team_code4"])
 
     xls_df.rename(
         columns={
@@ -266,7 +400,9 @@ def format_event_results_xls_dataframe(xls_path: pathlib.Path):
         },
         inplace=True,
     )
-    xls_df["points_scored_finals"] = xls_df["points_scored_finals"].apply(lambda x: Decimal(x) if x else None)
+    # Zero points is a score (not a blank), so only blanks are left without one
+    points = xls_df["points_scored_finals"]
+    xls_df["points_scored_finals"] = points.dropna().map(Decimal).reindex(points.index)
     return xls_df
 
 
@@ -317,32 +453,23 @@ def sort_event_results_dataframe(
     event_age_field: str = "event_age",
     event_sex_field: str = "event_sex",
     individual_or_relay_field: str = _INDIVIDUAL_OR_RELAY_FIELD,
-    stroke_sort_val: Tuple[str, Callable] = (
-        "stroke_sort_val",
-        lambda x: x.value,
-    ),
-    event_sex_sort_val: Tuple[str, Callable] = (
-        "event_sex_sort_val",
-        lambda x: x.value,
-    ),
     extra_sort_vals: List[Tuple[str, Callable]] = None,
     event_number_offset: int = 0,
 ):
-    """Infer the event_number for each result by building an event-only DataFrame
-    with events sorted in event_number order.
-    """
-    # Get Enum object values for sorting
-    xls_df[stroke_sort_val[0]] = xls_df[stroke_field].map(stroke_sort_val[1])
-    xls_df[event_sex_sort_val[0]] = xls_df[event_sex_field].map(event_sex_sort_val[1])
+    """Infer the event_number for each result by sorting results in event_number order
+    and numbering their events in that order.
 
+    The stroke and event sex columns sort by the order of their categorical dtype (SDIF code value order).
+    """
     # Get a sortable event age number
-    xls_df["event_age_sortable"] = xls_df[event_age_field].str.replace("UN", "00").str.replace("OV", "99").astype(int)
+    xls_df["event_age_sortable"] = (
+        xls_df[event_age_field].str.replace("UN", "00").str.replace("OV", "99").astype("int16")
+    )
 
     # Add another sort dimension to push the FR Open Relays last
-    xls_df["is_open_free_relay"] = xls_df.apply(
-        lambda x: x[event_age_field] == "UNOV" and x[stroke_field] == sdif.models.StrokeCode.free_relay,
-        axis="columns",
-    ).astype(bool)
+    xls_df["is_open_free_relay"] = (xls_df[event_age_field] == "UNOV") & (
+        xls_df[stroke_field] == sdif.models.StrokeCode.free_relay
+    )
 
     if extra_sort_vals:
         for sv in extra_sort_vals:
@@ -351,20 +478,15 @@ def sort_event_results_dataframe(
         by=[
             "is_open_free_relay",
             individual_or_relay_field,
-            stroke_sort_val[0],
+            stroke_field,
             "event_age_sortable",
-            event_sex_sort_val[0],
+            event_sex_field,
         ],
         ascending=[True, True, True, True, False],
         inplace=True,
     )
-    events_df = xls_df[[event_field]].copy()
-    events_df.drop_duplicates(inplace=True, ignore_index=True)
-    events_df.reset_index()
-    events_df.index = events_df.index + event_number_offset + 1
-    events_df["event_number"] = events_df.index
-
-    xls_df = xls_df.join(events_df.set_index(event_field), on=event_field)
+    # Number events in the order they first appear in the sorted results
+    xls_df["event_number"] = xls_df.groupby(event_field, sort=False).ngroup() + event_number_offset + 1
     return xls_df
 
 
@@ -424,20 +546,14 @@ def format_individual_xls_dataframe(xls_path: pathlib.Path):
     xls_df["age_or_class"] = pd.to_numeric(xls_df["swimmer_age_at_date_of_swim"])
 
     # Only derive a mmddyy birthday if you find six consecutive digits, fitting a birthday format, from the start of the USS#
-    mdy_regex = r"^(0[1-9]|1[0-2])(0[1-9]|[12][0-9]|3[01])(\d\d)"
-    bday_df = xls_df["ussn"].str.extract(pat=mdy_regex, expand=False)
-    xls_df["_birthdate_mmddyy"] = bday_df[0] + bday_df[1] + bday_df[2]  # concat mm + dd + yy from the regex extraction
+    xls_df["_birthdate_mmddyy"] = xls_df["ussn"].str.extract(pat=_MDY_RE, expand=False)
 
     # If the USS Number is messed up and not containing a birthday, force it to Jan 1 of their birth year
-    xls_df["_birthdate_mmddyy"] = xls_df.apply(
-        lambda x: (
-            datetime.date(x["date_of_swim"].year - int(x["age_or_class"]), 1, 1).strftime("%m%d%y")
-            if pd.isna(x["_birthdate_mmddyy"])
-            else x["_birthdate_mmddyy"]
-        ),
-        axis="columns",
-    )
+    no_birthdate = xls_df["_birthdate_mmddyy"].isna()
+    birth_year = xls_df.loc[no_birthdate, "date_of_swim"].dt.year - xls_df.loc[no_birthdate, "age_or_class"].astype(int)
+    xls_df.loc[no_birthdate, "_birthdate_mmddyy"] = "0101" + (birth_year % 100).astype(str).str.zfill(2)
 
+    # An explicit format is parsed without inferring it, and only once per distinct value (cache=True)
     xls_df["birthdate"] = pd.to_datetime(xls_df["_birthdate_mmddyy"], format="%m%d%y").dt.date
 
     # Set age_or_class to the effective age for the season given the age-up date
@@ -490,7 +606,7 @@ def format_individual_xls_dataframe(xls_path: pathlib.Path):
             "finals_place_ranking",
             "points_scored_finals",
         ]
-    ].copy()
+    ]
 
     missing_columns = [
         "seed_time",
@@ -508,8 +624,7 @@ def format_individual_xls_dataframe(xls_path: pathlib.Path):
         "flight_status",
         "centipoints_scored_finals",
     ]
-    for mc in missing_columns:
-        sd3_df[mc] = None
+    sd3_df = sd3_df.reindex(columns=[*sd3_df.columns, *missing_columns])  # missing columns are left blank
 
     return sd3_df
 
@@ -587,7 +702,7 @@ def format_relay_xls_dataframe(xls_path: pathlib.Path, max_individual_event: int
             "finals_place",
             "finals_points",
         ]
-    ].copy()
+    ]
 
     missing_columns = [
         "n_f0_records",
@@ -606,8 +721,7 @@ def format_relay_xls_dataframe(xls_path: pathlib.Path, max_individual_event: int
         "event_time_class_lower",
         "event_time_class_upper",
     ]
-    for mc in missing_columns:
-        sd3_df[mc] = None
+    sd3_df = sd3_df.reindex(columns=[*sd3_df.columns, *missing_columns])  # missing columns are left blank
 
     return sd3_df
 
@@ -627,15 +741,14 @@ def format_swimmers_dataframe(xls_indiv_df: pd.DataFrame):
             "age_or_class",
             "sex",
         ]
-    ].copy()
+    ]
 
     # Must exclude the LSC when doing duplicates. Finding some meets have the same team (and swimmers) and reuslts twice, with different LSCs
-    swimmer_df.drop_duplicates(inplace=True, ignore_index=True, subset=swimmer_df.columns.difference(["lsc"]))
-    swimmer_df.reset_index()
+    swimmer_df = swimmer_df.drop_duplicates(ignore_index=True, subset=swimmer_df.columns.difference(["lsc"]))
     return swimmer_df
 
 
-def format_individual_info_dataframe(xls_indiv_df: pd.DataFrame):
+def format_individual_info_dataframe(xls_indiv_df: pd.DataFrame, swimmer_df: Optional[pd.DataFrame] = None):
     #############################
     #### IndividualInfo (D3) ####
     #############################
@@ -653,10 +766,12 @@ def format_individual_info_dataframe(xls_indiv_df: pd.DataFrame):
     # - water_polo: Optional[bool] = spec(41, 1)
     # - none: Optional[bool] = spec(42, 1)
 
-    swimmers_df = format_swimmers_dataframe(xls_indiv_df)
+    # Reuse the swimmers already consolidated from these individual events, if given
+    swimmers_df = format_swimmers_dataframe(xls_indiv_df) if swimmer_df is None else swimmer_df
 
-    sd3_df = swimmers_df[["team_code_tu", "uss_number_new"]].copy()  # Keeping around to help split records by team
-    sd3_df["summer_league"] = IS_SUMMER_LEAGUE
+    sd3_df = swimmers_df[["team_code_tu", "uss_number_new"]].assign(  # Keeping around to help split records by team
+        summer_league=IS_SUMMER_LEAGUE
+    )
 
     sd3_df.rename(
         columns={
@@ -678,14 +793,16 @@ def format_individual_info_dataframe(xls_indiv_df: pd.DataFrame):
         "water_polo",
         "none",
     ]
-    for mc in missing_columns:
-        sd3_df[mc] = None
+    sd3_df = sd3_df.reindex(columns=[*sd3_df.columns, *missing_columns])  # missing columns are left blank
 
     return sd3_df
 
 
 def format_relay_swimmers_xls_dataframe(
-    xls_indiv_df: pd.DataFrame, xls_path: pathlib.Path, max_individual_event: int = 1
+    xls_indiv_df: pd.DataFrame,
+    xls_path: pathlib.Path,
+    max_individual_event: int = 1,
+    swimmer_df: Optional[pd.DataFrame] = None,
 ):
     ############################################################
     #### RelayName (F0) - Names of swimmers in a relay team ####
@@ -709,39 +826,33 @@ def format_relay_swimmers_xls_dataframe(
     # - preferred_first_name: Optional[str] = spec(107, 15)
 
     # Start with parsing+formatting the common relay event fields
-    xls_df = format_relay_event_results_xls_dataframe(xls_path, max_individual_event).copy()
+    xls_df = format_relay_event_results_xls_dataframe(xls_path, max_individual_event)
 
     # Transform the relay team text into a list of relay swimmer names
-    xls_df["relay_swimmers"] = xls_df["Relay\nTeam"].str.replace(" »", "").str.split(pat="\n", expand=False).str[-4:]
+    xls_df["swimmer_name"] = xls_df["Relay\nTeam"].str.replace(" »", "").str.split(pat="\n", expand=False).str[-4:]
 
-    # Explode the embedded lists into their own Series that maintains the index of the original row they came from,
-    # and join back with original DataFrame to create a product of the two
-    xls_df = xls_df.join(xls_df["relay_swimmers"].explode(), lsuffix="_list", rsuffix="_name")
+    # Explode the embedded lists into a row per swimmer, each keeping the index of the relay row they came from
+    xls_df = xls_df.explode("swimmer_name")
 
-    # Set position (order) of each swimmer in their relay
-    xls_df["finals_order"] = xls_df.apply(
-        lambda x: sdif.models.OrderCode(str(x["relay_swimmers_list"].index(x["relay_swimmers_name"]) + 1)),
-        axis="columns",
-    )
+    # Set position (order) of each swimmer in their relay, which is the order they were exploded out of its row
+    xls_df["finals_order"] = (xls_df.groupby(level=0).cumcount() + 1).astype(str).map(sdif.models.OrderCode)
 
     # Join relays-with-swimmer-names DataFrame back to individual swimmer events DataFrame to get swimmer details
     # This is the best we can do since the Relay Swimmers in the Team Unify Relay XLS download don't include any more
     # detail than their full names.
     # This may cause conflicts if two swimmers in the same meet and on the same team have the same full name
-    swimmer_df = format_swimmers_dataframe(xls_indiv_df)
+    if swimmer_df is None:
+        swimmer_df = format_swimmers_dataframe(xls_indiv_df)
     xls_df = xls_df.join(
         swimmer_df.set_index(["name", "team_code_tu"]),
-        on=["relay_swimmers_name", "team_code_tu"],
+        on=["swimmer_name", "team_code_tu"],
         rsuffix="_from_relay",
     )
 
-    xls_df = xls_df.replace({np.nan: None})
-
     # Rename fields from IndividualEvent or RelayEvent formatting, to match RelayName field names
     xls_df.rename(
         columns={
             "finals_course": "course",
-            "relay_swimmers_name": "swimmer_name",
             "ussn": "uss_number",
         },
         inplace=True,
@@ -769,7 +880,7 @@ def format_relay_swimmers_xls_dataframe(
             "stroke",
             "event_age",
         ]
-    ].copy()
+    ]
 
     missing_columns = [
         "prelim_order",
@@ -778,8 +889,7 @@ def format_relay_swimmers_xls_dataframe(
         "takeoff_time",
         "preferred_first_name",
     ]
-    for mc in missing_columns:
-        sd3_df[mc] = None
+    sd3_df = sd3_df.reindex(columns=[*sd3_df.columns, *missing_columns])  # missing columns are left blank
 
     return sd3_df
 
@@ -798,33 +908,43 @@ def build_sd3(individual_xls: pathlib.Path, relay_xls: pathlib.Path = None):
     base_name = re.sub(r"individual", "", str(individual_xls).rsplit(".")[0], flags=re.I)
     base_name = "results" if not base_name else base_name
 
-    sd3_records = []
+    # Groups of records in file order. The record generators are lazy, so records are only built as they're written
+    sd3_record_groups = []
 
-    lsc = SWIM_TEAM_INFO["swim_team"]["local_swim_committee"]
-    our_team_code_tu = SWIM_TEAM_INFO["swim_team"]["team_unify_team_code"]
+    team = SWIM_TEAM_INFO["swim_team"]
+    lsc = team["local_swim_committee"]
+    our_team_code_tu = team["team_unify_team_code"]
 
     # SDIF files only allow 4 character team_codes, preceded by a two-character LSC, for a total of 6
     # If a team code in a league has 5 characters, the 5th is stored in the "team_code5" field
     our_team_code4 = our_team_code_tu[:4]
     our_team_code5 = our_team_code_tu[4:]
-    teams_in_meet = [
-        t.split("-")[1]
-        for t in pd.read_excel(individual_xls, engine="openpyxl")["LSC-Team"]
-        .drop_duplicates(ignore_index=True)
-        .to_list()
-    ]
 
     # Parse XLS files and build-up the DataFrames
     xls_indiv_df = format_individual_xls_dataframe(individual_xls)
+    # Teams in the order they appear in the file, from the parse of it already made (and cached) above, since
+    # xls_indiv_df has been re-sorted by event
+    teams_in_meet = _format_event_results_xls_dataframe(individual_xls)["team_code_tu"].unique().tolist()
     max_individual_event = xls_indiv_df["event_number"].max()
+    swimmer_df = format_swimmers_dataframe(xls_indiv_df)
     xls_relay_df = None
     xls_relay_swimmers_df = None
     if relay_xls:
         xls_relay_df = format_relay_xls_dataframe(relay_xls, max_individual_event)
         xls_relay_swimmers_df = format_relay_swimmers_xls_dataframe(
-            xls_indiv_df=xls_indiv_df, xls_path=relay_xls, max_individual_event=max_individual_event
+            xls_indiv_df=xls_indiv_df,
+            xls_path=relay_xls,
+            max_individual_event=max_individual_event,
+            swimmer_df=swimmer_df,
         )
 
+    # Split each DataFrame by team once, rather than filtering the whole DataFrame for every team
+    xls_indiv_df_by_team = _split_by_team(xls_indiv_df)
+    swimmer_df_by_team = _split_by_team(swimmer_df)
+    if relay_xls:
+        xls_relay_df_by_team = _split_by_team(xls_relay_df)
+        xls_relay_swimmers_df_by_team = _split_by_team(xls_relay_swimmers_df)
+
     # A0
     a0 = sdif.models.FileDescription(
         organization=sdif.models.OrganizationCode.uss,
@@ -842,15 +962,15 @@ def build_sd3(individual_xls: pathlib.Path, relay_xls: pathlib.Path = None):
     b1 = sdif.models.Meet(
         organization=sdif.models.OrganizationCode.uss,
         meet_name=base_name[0:30],
-        meet_address_1=SWIM_TEAM_INFO["swim_team"]["address_line_1"],
+        meet_address_1=team["address_line_1"],
         meet_address_2=None,
-        meet_city=SWIM_TEAM_INFO["swim_team"]["city"],
-        meet_state=SWIM_TEAM_INFO["swim_team"]["state"],
-        postal_code=SWIM_TEAM_INFO["swim_team"]["postal_code"],
+        meet_city=team["city"],
+        meet_state=team["state"],
+        postal_code=team["postal_code"],
         country="USA",
         meet=sdif.models.MeetTypeCode.dual,
-        meet_start=xls_indiv_df["date_of_swim"].min(),
-        meet_end=xls_indiv_df["date_of_swim"].max(),
+        meet_start=xls_indiv_df["date_of_swim"].min().date(),
+        meet_end=xls_indiv_df["date_of_swim"].max().date(),
         pool_altitude_ft=0,
         # TODO: May need to cross reference this against where it was actually swam,
         #  which could be yards
@@ -861,161 +981,240 @@ def build_sd3(individual_xls: pathlib.Path, relay_xls: pathlib.Path = None):
     c1_us = sdif.models.TeamId(
         organization=sdif.models.OrganizationCode.uss,
         team_code=lsc + our_team_code4,
-        name=SWIM_TEAM_INFO["swim_team"]["full_name"],
-        abbreviation=SWIM_TEAM_INFO["swim_team"]["abbreviation"],
-        address_1=SWIM_TEAM_INFO["swim_team"]["address_line_1"],
+        name=team["full_name"],
+        abbreviation=team["abbreviation"],
+        address_1=team["address_line_1"],
         address_2=None,
-        city=SWIM_TEAM_INFO["swim_team"]["city"],
-        state=SWIM_TEAM_INFO["swim_team"]["state"],
-        postal_code=SWIM_TEAM_INFO["swim_team"]["postal_code"],
+        city=team["city"],
+        state=team["state"],
+        postal_code=team["postal_code"],
         country="USA",
         region=None,
         team_code5=our_team_code5,
     )
 
     # Append Meet setup records and our team's individual records
-    sd3_records.extend([a0, b1, c1_us])
+    sd3_record_groups.append([a0, b1, c1_us])
 
     # D0 and D3
-    sd3_records.extend(generate_individual_records(our_team_code_tu, xls_indiv_df))
+    sd3_record_groups.append(
+        generate_individual_records(xls_indiv_df_by_team[our_team_code_tu], swimmer_df_by_team[our_team_code_tu])
+    )
 
     # E0 and F0
     if relay_xls:
-        sd3_records.extend(generate_relay_records(our_team_code_tu, xls_relay_df, xls_relay_swimmers_df))
+        sd3_record_groups.append(
+            generate_relay_records(
+                xls_relay_df_by_team[our_team_code_tu], xls_relay_swimmers_df_by_team[our_team_code_tu]
+            )
+        )
 
     # Generate opposing teams' TeamId (C1) record, individual records (D0, D3), and relay records (E0, F0)
-    for opp in teams_in_meet:
-        if opp == our_team_code_tu:
-            continue
-        # See comment above about 4 and 5 character codes
-        opp_team_code4 = opp[:4]
-        opp_team_code5 = opp[4:]
-
-        # C1
-        c1_opp = sdif.models.TeamId(
-            organization=sdif.models.OrganizationCode.uss,
-            team_code=lsc + opp_team_code4,
-            name=lsc + "-" + opp,
-            abbreviation=None,
-            address_1=None,
-            address_2=None,
-            city=None,
-            state="VA",
-            postal_code=None,
-            country="USA",
-            region=None,
-            team_code5=opp_team_code5,
+    opponents_args = [
+        (
+            lsc,
+            opp,
+            xls_indiv_df_by_team[opp],
+            swimmer_df_by_team[opp],
+            xls_relay_df_by_team[opp] if relay_xls else None,
+            xls_relay_swimmers_df_by_team[opp] if relay_xls else None,
         )
-        sd3_records.append(c1_opp)
+        for opp in teams_in_meet
+        if opp != our_team_code_tu
+    ]
+    opponent_rows = sum(
+        len(indiv_df) + (0 if relay_df is None else len(relay_df)) for _, _, indiv_df, _, relay_df, _ in opponents_args
+    )
+    max_workers = min(len(opponents_args), os.cpu_count() or 1)
+    if max_workers > 1 and opponent_rows >= _MIN_OPPONENT_ROWS_TO_PARALLELIZE:
+        # Each opposing team's records are independent of the others', so build them in parallel, keeping file order
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            sd3_record_groups.extend(executor.map(generate_opponent_records, *zip(*opponents_args)))
+    else:
+        sd3_record_groups.extend(itertools.starmap(generate_opponent_records, opponents_args))
 
-        # D0 and D3
-        sd3_records.extend(generate_individual_records(opp, xls_indiv_df))
+    # Build the .sd3 file in the same directory
+    sd3_path = pathlib.Path(f"{base_name}.sd3")
+    # SDIF is fixed-width ASCII with its own CRLF record separators, so no newline translation, and any non-ASCII
+    # character is replaced rather than written as multiple bytes that would shift the columns after it
+    with sd3_path.open("w", buffering=1 << 20, encoding="ascii", errors="replace", newline="") as f:
+        # Stream records out one at a time, separated like sdif.records.encode_records does
+        for record_number, record in enumerate(itertools.chain.from_iterable(sd3_record_groups)):
+            if record_number:
+                f.write(sdif.records.RECORD_SEP)
+            record_line = sdif.records.encode_record(record, strict=False)
+            if not record_line.isascii():
+                print(f'WARNING: Writing "?" for the non-ASCII characters in record:\n\t{record_line}')
+            f.write(record_line)
+        # Z0, already encoded
+        f.write(sdif.records.RECORD_SEP)
+        f.write(_Z0_RECORD)
+
+    print(f"Built SDIF file: {sd3_path}")
+
+
+def _with_none_for_missing(df: pd.DataFrame):
+    """Swap the missing-value markers (NaN, NaT, pd.NA) for None in the columns that have any, since SDIF record fields
+    take None for a blank"""
+    missing_columns = df.columns[df.isna().any()]
+    if missing_columns.empty:
+        return df
+    return df.assign(
+        **{column: df[column].astype(object).where(df[column].notna(), None) for column in missing_columns}
+    )
 
-        # E0 and F0
-        if relay_xls:
-            sd3_records.extend(generate_relay_records(opp, xls_relay_df, xls_relay_swimmers_df))
 
-    # Z0
-    z0 = TouchPadFileTerminator(
-        organization=sdif.models.OrganizationCode.uss,
-        file_code=sdif.models.FileCode.meet_results,
-        notes=None,
-    )
-    sd3_records.append(z0)
+def _iter_records(df: pd.DataFrame):
+    """Iterate rows as dicts, like to_dict(orient="records"), but from plain row tuples and one row at a time"""
+    columns = df.columns.tolist()
+    return (dict(zip(columns, row)) for row in df.itertuples(index=False, name=None))
 
-    # Build the .sd3 file in the same directory
-    sd3_file_name = f"{base_name}.sd3"
-    with open(f"{base_name}.sd3", "w") as f:
-        f.write(sdif.records.encode_records(sd3_records))
 
-    print(f"Built SDIF file: {sd3_file_name}")
+def _split_by_team(df: pd.DataFrame):
+    """Split a DataFrame into a DataFrame per team, keyed by team_code_tu, in one groupby pass rather than a mask per
+    team. Teams without any rows get an empty DataFrame"""
+    empty_df = df.iloc[:0]
+    return collections.defaultdict(lambda: empty_df, tuple(df.groupby("team_code_tu", sort=False)))
 
 
-def generate_individual_records(team_code_tu: str, xls_indiv_df: pd.DataFrame):
-    """Generate D0 IndividualEvent and singular D3 IndividualInfo records in the order required by SDIF files for the given team
+def generate_individual_records(xls_indiv_df_team: pd.DataFrame, swimmer_df_team: Optional[pd.DataFrame] = None):
+    """Generate D0 IndividualEvent and singular D3 IndividualInfo records in the order required by SDIF files for one team
 
     Args:
-        xls_indiv_df (DataFrame): The pandas DataFrame of individual event results parsed from the XLS individual results file
-        team_code_tu (str): The Team Unify code (max of 5 chars, and without LSC prepended) for the team for whose individuals
-            you want to generate records
+        xls_indiv_df_team (DataFrame): The pandas DataFrame of individual event results parsed from the XLS individual
+            results file, already filtered to the team for whose individuals you want to generate records
+        swimmer_df_team (DataFrame): Optional pandas DataFrame of distinct swimmers already consolidated from
+            xls_indiv_df_team
     """
     individual_key_col = "uss_number"
 
-    # Filter meet individual results by given team
-    xls_indiv_df_team = xls_indiv_df[xls_indiv_df.team_code_tu == team_code_tu].copy()
-
     # Format into IndividualInfo DataFrame
-    ii_df = format_individual_info_dataframe(xls_indiv_df_team)
+    ii_df = format_individual_info_dataframe(xls_indiv_df_team, swimmer_df_team)
     ii_df.drop("team_code_tu", axis="columns", inplace=True)
-    ii_df.set_index(individual_key_col, inplace=True)
-    ii_df[individual_key_col] = ii_df.index
-    ii_dict = ii_df.to_dict(orient="index")
-
-    # Cleanup and sort by individuals' last name
-    xls_indiv_df_team.drop(["lsc", "team_code_tu"], axis="columns", inplace=True)
-    xls_indiv_df_team.sort_values(by=["name"], inplace=True)
+    ii_df = _with_none_for_missing(ii_df)
+    ii_dict = {ii[individual_key_col]: ii for ii in _iter_records(ii_df)}
+
+    # Cleanup and sort by individuals' last name, keeping each individual's events in event order
+    xls_indiv_df_team = (
+        xls_indiv_df_team.drop(columns=["lsc", "team_code_tu"])
+        .sort_values(by=["name"], kind="stable")
+        .assign(date_of_swim=lambda df: df["date_of_swim"].dt.date)
+    )
+    xls_indiv_df_team = _with_none_for_missing(xls_indiv_df_team)
 
     # d0s_and_d3s_us = []
-    for d0_dict in xls_indiv_df_team.to_dict(orient="records"):
-        d3_dict = ii_dict.pop(
-            d0_dict.pop("uss_number_new"), None
-        )  # pop ensures D3 records is only written once per individual
-        yield sdif.models.IndividualEvent(**d0_dict)  # D0
-        if d3_dict:
-            yield sdif.models.IndividualInfo(**d3_dict)
+    # Record classes bound to locals, to skip the module attribute lookups for every row
+    individual_event, individual_info = sdif.models.IndividualEvent, sdif.models.IndividualInfo
+    d3_written = set()  # ensures D3 records is only written once per individual
+    for d0_dict in _iter_records(xls_indiv_df_team):
+        uss_number = d0_dict.pop("uss_number_new")
+        yield individual_event(**d0_dict)  # D0
+        if uss_number not in d3_written and uss_number in ii_dict:
+            d3_written.add(uss_number)
+            yield individual_info(**ii_dict[uss_number])
 
 
-def generate_relay_records(team_code_tu: str, xls_relay_df: pd.DataFrame, xls_relay_swimmers_df: pd.DataFrame):
-    """Generate E0 RelayEvent and F0 RelayName records in the order required by SDIF files for the given team
+def generate_relay_records(xls_relay_df_team: pd.DataFrame, xls_relay_swimmers_df_team: pd.DataFrame):
+    """Generate E0 RelayEvent and F0 RelayName records in the order required by SDIF files for one team
 
     Args:
-        team_code_tu (str): The Team Unify code (max of 5 chars, and without LSC prepended) for the team for whose individuals
-            you want to generate records
-        xls_relay_df (DataFrame): The pandas DataFrame of relay event results parsed from the XLS relay results file
-        xls_relay_swimmers_df (DataFrame): The pandas DataFrame of swimmers in each relay event result parsed from the XLS relay results file
+        xls_relay_df_team (DataFrame): The pandas DataFrame of relay event results parsed from the XLS relay results
+            file, already filtered to the team for whose relays you want to generate records
+        xls_relay_swimmers_df_team (DataFrame): The pandas DataFrame of swimmers in each relay event result parsed from
+            the XLS relay results file, already filtered to the same team
     """
-    xls_relay_df_team = xls_relay_df[xls_relay_df.team_code_tu == team_code_tu].copy()
-    xls_relay_df_team.drop("team_code_tu", axis="columns", inplace=True)
-    xls_relay_swimmers_df_team = xls_relay_swimmers_df[xls_relay_swimmers_df.team_code_tu == team_code_tu].copy()
-    xls_relay_swimmers_df_team.drop("team_code_tu", axis="columns", inplace=True)
-
-    for e0_dict in xls_relay_df_team.to_dict(orient="records"):
-        yield sdif.models.RelayEvent(**e0_dict)  # E0
-
-        # Lookup swimmers in this relay event by event details
-        swimmers_in_relay_df = xls_relay_swimmers_df_team[
-            (xls_relay_swimmers_df_team.relay_team_name == e0_dict["relay_team_name"])
-            & (xls_relay_swimmers_df_team.event_number == e0_dict["event_number"])
-            & (xls_relay_swimmers_df_team.event_sex == e0_dict["event_sex"])
-            & (xls_relay_swimmers_df_team.relay_distance == e0_dict["relay_distance"])
-            & (xls_relay_swimmers_df_team.stroke == e0_dict["stroke"])
-            & (xls_relay_swimmers_df_team.event_age == e0_dict["event_age"])
-        ].copy()
-
+    xls_relay_df_team = xls_relay_df_team.drop(columns="team_code_tu").assign(
+        swim_date=lambda df: df["swim_date"].dt.date
+    )
+    xls_relay_swimmers_df_team = xls_relay_swimmers_df_team.drop(columns="team_code_tu")
+    xls_relay_df_team = _with_none_for_missing(xls_relay_df_team)
+    xls_relay_swimmers_df_team = _with_none_for_missing(xls_relay_swimmers_df_team)
+
+    # Group swimmers by the details of the relay event they swam in, to look up the swimmers in each relay event
+    relay_event_fields = [
+        "relay_team_name",
+        "event_number",
+        "event_sex",
+        "relay_distance",
+        "stroke",
+        "event_age",
+    ]
+    swimmers_by_relay_event = {
         # Drop the fields kept around for RelayEvent lookup, that are not captured in the RelayName record
-        swimmers_in_relay_df.drop(
-            [
-                "event_number",
-                "event_sex",
-                "relay_distance",
-                "stroke",
-                "event_age",
-            ],
-            axis="columns",
-            inplace=True,
+        relay_event: list(_iter_records(swimmers_in_relay_df.drop(relay_event_fields[1:], axis="columns")))
+        for relay_event, swimmers_in_relay_df in xls_relay_swimmers_df_team.groupby(
+            relay_event_fields, sort=False, observed=True
         )
-        yield from (sdif.models.RelayName(**rs) for rs in swimmers_in_relay_df.to_dict(orient="records"))  # F0s
+    }
+
+    # Record classes bound to locals, to skip the module attribute lookups for every row
+    relay_event_record, relay_name = sdif.models.RelayEvent, sdif.models.RelayName
+    for e0_dict in _iter_records(xls_relay_df_team):
+        yield relay_event_record(**e0_dict)  # E0
+
+        relay_event = tuple(e0_dict[field] for field in relay_event_fields)
+        yield from (relay_name(**rs) for rs in swimmers_by_relay_event.get(relay_event, []))  # F0s
+
+
+def generate_opponent_records(
+    lsc: str,
+    team_code_tu: str,
+    xls_indiv_df_team: pd.DataFrame,
+    swimmer_df_team: pd.DataFrame,
+    xls_relay_df_team: Optional[pd.DataFrame] = None,
+    xls_relay_swimmers_df_team: Optional[pd.DataFrame] = None,
+):
+    """Generate an opposing team's TeamId (C1) record, individual records (D0, D3), and relay records (E0, F0) in the
+    order required by SDIF files. Returned as a list rather than yielded, so it can be built in a worker process
+
+    Args:
+        lsc (str): The two-character Local Swim Committee the teams in the meet belong to
+        team_code_tu (str): The Team Unify code (max of 5 chars, and without LSC prepended) of the opposing team
+        xls_indiv_df_team (DataFrame): The opposing team's individual event results
+        swimmer_df_team (DataFrame): The opposing team's distinct swimmers
+        xls_relay_df_team (DataFrame): The opposing team's relay event results, if there was a relay results file
+        xls_relay_swimmers_df_team (DataFrame): The opposing team's swimmers in each relay event result, if there was a
+            relay results file
+    """
+    # See comment in build_sd3 about 4 and 5 character codes
+    team_code4 = team_code_tu[:4]
+    team_code5 = team_code_tu[4:]
+
+    # C1
+    c1_opp = sdif.models.TeamId(
+        organization=sdif.models.OrganizationCode.uss,
+        team_code=lsc + team_code4,
+        name=lsc + "-" + team_code_tu,
+        abbreviation=None,
+        address_1=None,
+        address_2=None,
+        city=None,
+        state="VA",
+        postal_code=None,
+        country="USA",
+        region=None,
+        team_code5=team_code5,
+    )
+    opp_records = [c1_opp]
+
+    # D0 and D3
+    opp_records.extend(generate_individual_records(xls_indiv_df_team, swimmer_df_team))
+
+    # E0 and F0
+    if xls_relay_df_team is not None:
+        opp_records.extend(generate_relay_records(xls_relay_df_team, xls_relay_swimmers_df_team))
+    return opp_records
 
 
 def parse_sd3(file_path: pathlib.Path):
-    rtc_list = []
+    rtc_counts = collections.Counter()
     with open(file_path, "rt") as sd3_file:
         print(f"Attempting to parse all lines of {file_path}...")
-        for line in sd3_file.readlines():
+        for line in sd3_file:
             rtc = line[:2]
-            if rtc not in rtc_list:
+            if rtc not in rtc_counts:
                 print(f'Found new record type code "{rtc}". Parsing first line with this code')
-            rtc_list.append(rtc)
+            rtc_counts[rtc] += 1
             try:
                 record_type = sdif.model_meta.REGISTERED_MODELS[rtc]
                 rec = sdif.records.decode_record(record=line, record_type=record_type, strict=False)
@@ -1023,12 +1222,12 @@ def parse_sd3(file_path: pathlib.Path):
                 print(f'Failed to parse line with record type code "{rtc}":\n\t{line}')
                 print(str(e))
                 # Swallow, and keep going
-    print(pd.DataFrame(rtc_list).value_counts().to_string())
+    print(pd.Series(rtc_counts).sort_values(ascending=False).to_string())
 
 
 def print_sd3(file_path: pathlib.Path):
     with open(file_path, "rt") as sd3_file:
-        for line in sd3_file.readlines():
+        for line in sd3_file:
             print(f"{line}")
 
 
@@ -1038,7 +1237,7 @@ def print_xls(
     format: Literal["raw", "individual", "relay_event", "relay_swimmers"] = "raw",
 ):
     if format == "raw":
-        xls_df = pd.read_excel(file_path, engine="openpyxl")
+        xls_df = pd.read_excel(file_path, engine="calamine")
     elif format == "individual":
         xls_df = format_individual_xls_dataframe(file_path)
     elif format == "relay_event":
@@ -1050,8 +1249,9 @@ def print_xls(
         raise ValueError(f"format = {format} is not valid")
 
     print(xls_df.dtypes)
-    print(xls_df.to_string())
-    print(xls_df.dtypes)
+    # pandas renders the whole table as one string either way, this just hands it to stdout directly
+    xls_df.to_string(buf=sys.stdout)
+    print()
 
 
 def concat_xls(base_name: str):
@@ -1062,24 +1262,59 @@ def concat_xls(base_name: str):
         pathlib.Path(f"{base_name}_fly.xls"),
         pathlib.Path(f"{base_name}_im.xls"),
     ]
-    if all(not f.exists for f in files):
+    files = [f for f in files if f.exists()]
+    if not files:
         print(f"No files found to combine given base path {base_name}")
         return
 
-    concat_df = None
-    with warnings.catch_warnings():  # suppress annoying openpyxl warnings about workbook style
-        warnings.simplefilter("ignore")
-        concat_df = pd.concat((pd.read_excel(f, engine="openpyxl") for f in files if f.exists()), ignore_index=True)
     concat_path = pathlib.Path(f"{base_name}_concat.xls")
-    with pd.ExcelWriter(concat_path, engine="openpyxl") as writer:  # defaults to openpyxl when writing .xls extension
-        # Have to get into the guts of the writer to apply wrap style, so that newlines from the downloaded .xls
-        # files are maintained after concatenation
-        concat_df.to_excel(writer, sheet_name="Individual Results", index=False)
-        worksheet = writer.sheets["Individual Results"]
-        wrapped = Alignment(wrap_text=True)
-        for row in worksheet.iter_rows():
-            for cell in row:
-                cell.alignment = wrapped
+    concat_book = openpyxl.Workbook()
+    worksheet = concat_book.active
+    worksheet.title = "Individual Results"
+    with contextlib.ExitStack() as open_files:
+        # Rows are copied over as-is, so there's no need to parse them into a DataFrame. Opened as a file because
+        # openpyxl refuses paths with a .xls extension, though the downloaded files are really .xlsx
+        xls_sheets = []
+        for f in files:
+            xls_book = openpyxl.load_workbook(open_files.enter_context(f.open("rb")), read_only=True, data_only=True)
+            open_files.callback(xls_book.close)
+            xls_sheet = xls_book.active
+            xls_sheet.reset_dimensions()  # don't trust the sheet's recorded size when streaming its rows
+            xls_sheets.append(xls_sheet)
+
+        # Files may not have the same columns, or have them in the same order, so line them up by header name, under
+        # all the files' columns in the order first seen
+        headers = [
+            [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+            for header in (next(xls_sheet.iter_rows(max_row=1, values_only=True), ()) for xls_sheet in xls_sheets)
+        ]
+        concat_header = list(dict.fromkeys(name for header in headers for name in header))
+        concat_column_index = {name: i for i, name in enumerate(concat_header)}
+        worksheet.append(concat_header)
+
+        for xls_sheet, header in zip(xls_sheets, headers):
+            column_indexes = [concat_column_index[name] for name in header]
+            same_columns = column_indexes == list(range(len(concat_header)))
+            for row in xls_sheet.iter_rows(min_row=2, values_only=True):
+                if all(value is None for value in row):
+                    continue
+                if not same_columns:
+                    concat_row = [None] * len(concat_header)
+                    for i, value in zip(column_indexes, row):
+                        concat_row[i] = value
+                    row = concat_row
+                worksheet.append(row)
+
+    # Apply wrap style, so that newlines from the downloaded .xls files are maintained after concatenation. All cells
+    # share a wrapped named style registered once, rather than each getting its own Alignment
+    concat_book.add_named_style(NamedStyle(name="wrapped", alignment=Alignment(wrap_text=True)))
+    for row in worksheet.iter_rows():
+        for cell in row:
+            cell.style = "wrapped"
+    header_font = Font(bold=True)
+    for cell in worksheet[1]:
+        cell.font = header_font
+    concat_book.save(concat_path)
     print(f"Files combined into {concat_path}")
 
 